@@ -1,6 +1,16 @@
 import logging
 import requests
 import sys
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+# Session reused by every cerberus check so the connection is kept alive across checks
+# instead of being set up again after each scenario, connection errors are retried
+session = requests.Session()
+adapter = HTTPAdapter(pool_connections=4, pool_maxsize=4, max_retries=Retry(total=3, backoff_factor=0.3))
+session.mount("http://", adapter)
+session.mount("https://", adapter)
 
 
 # Get cerberus status
@@ -11,7 +21,7 @@ def get_status(config):
         if not cerberus_url:
             logging.error("url where Cerberus publishes True/False signal is not provided.")
             sys.exit(1)
-        cerberus_status = requests.get(cerberus_url).content
+        cerberus_status = session.get(cerberus_url).content
         cerberus_status = True if cerberus_status == b"True" else False
         if not cerberus_status:
             logging.error(
@@ -14,6 +14,16 @@ def invoke(command):
     return out
 
 
+# Invokes a command given as an argument list without going through a shell and returns the stdout
+def invoke_argv(argv):
+    try:
+        output = subprocess.run(argv, universal_newlines=True, stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+    except Exception as e:
+        logging.error("Failed to run %s, error: %s" % (" ".join(argv), e))
+        raise
+    return output.stdout
+
+
 def run(command):
     try:
         subprocess.run(command, shell=True, universal_newlines=True, timeout=45)
@@ -1,20 +1,49 @@
-from kubernetes import client, config
+from kubernetes import client, config, watch
 from kubernetes.stream import stream
 from kubernetes.client.rest import ApiException
 import logging
-import kraken.invoke.command as runcommand
 import json
 import sys
 import re
+import threading
 
 kraken_node_name = ""
 
+# Label set on the kraken pods by containers/kraken.yml
+kraken_label_selector = "tool=Kraken"
+
+# Number of objects to request per page when listing cluster wide resources
+list_page_limit = 500
+
+# stream() swaps the request method of the api client for the duration of an exec and
+# restores it afterwards, so execs on the shared client have to run one at a time
+exec_lock = threading.Lock()
+
 
 # Load kubeconfig and initialize kubernetes python client
 def initialize_clients(kubeconfig_path):
     global cli
+    global custom_object_client
     config.load_kube_config(kubeconfig_path)
     cli = client.CoreV1Api()
+    custom_object_client = client.CustomObjectsApi()
+
+
+# Get the url of the api server the clients talk to
+def get_host():
+    return cli.api_client.configuration.host
+
+
+# Get the OpenShift cluster version, returns None on clusters without the clusterversion resource
+def get_clusterversion():
+    try:
+        cluster_version = custom_object_client.get_cluster_custom_object(
+            "config.openshift.io", "v1", "clusterversions", "version"
+        )
+    except ApiException as e:
+        logging.info("Unable to get the cluster version: %s" % e.reason)
+        return None
+    return cluster_version["status"]["desired"]["version"]
 
 
 # List all namespaces
@@ -36,13 +65,22 @@ def list_namespaces(label_selector=None):
 def check_namespaces(namespaces, label_selectors=None):
     try:
         valid_namespaces = list_namespaces(label_selectors)
-        regex_namespaces = set(namespaces) - set(valid_namespaces)
-        final_namespaces = set(namespaces) - set(regex_namespaces)
+        # Split the given namespaces into existing ones and patterns in a single pass
+        existing_namespaces = set(valid_namespaces)
+        final_namespaces = set()
+        regex_namespaces = set()
+        for namespace in namespaces:
+            if namespace in existing_namespaces:
+                final_namespaces.add(namespace)
+            else:
+                regex_namespaces.add(namespace)
         valid_regex = set()
         if regex_namespaces:
+            # Compile the patterns once rather than on every namespace they are matched against
+            regex_searches = [(regex, re.compile(regex).search) for regex in regex_namespaces]
             for namespace in valid_namespaces:
-                for regex_namespace in regex_namespaces:
-                    if re.search(regex_namespace, namespace):
+                for regex_namespace, regex_search in regex_searches:
+                    if regex_search(namespace):
                         final_namespaces.add(namespace)
                         valid_regex.add(regex_namespace)
                         break
@@ -104,14 +142,28 @@ def list_pods(namespace):
     return pods
 
 
+# Iterate over the pods in all the namespaces, fetching one page at a time
+# The raw response is decoded with json instead of being deserialized into V1Pod
+# models which is by far the most expensive part of the call
+def iterate_all_pods(label_selector=None):
+    _continue = None
+    while True:
+        ret = cli.list_pod_for_all_namespaces(
+            label_selector=label_selector, limit=list_page_limit, _continue=_continue, _preload_content=False
+        )
+        pod_list = json.loads(ret.data)
+        for pod in pod_list["items"]:
+            yield pod
+        # An empty or missing continue token means this was the last page
+        _continue = pod_list["metadata"].get("continue")
+        if not _continue:
+            break
+
+
 def get_all_pods(label_selector=None):
     pods = []
-    if label_selector:
-        ret = cli.list_pod_for_all_namespaces(pretty=True, label_selector=label_selector)
-    else:
-        ret = cli.list_pod_for_all_namespaces(pretty=True)
-    for pod in ret.items:
-        pods.append([pod.metadata.name, pod.metadata.namespace])
+    for pod in iterate_all_pods(label_selector):
+        pods.append([pod["metadata"]["name"], pod["metadata"]["namespace"]])
     return pods
 
 
@@ -120,16 +172,17 @@ def exec_cmd_in_pod(command, pod_name, namespace):
 
     exec_command = ["bash", "-c", command]
     try:
-        ret = stream(
-            cli.connect_get_namespaced_pod_exec,
-            pod_name,
-            namespace,
-            command=exec_command,
-            stderr=True,
-            stdin=False,
-            stdout=True,
-            tty=False,
-        )
+        with exec_lock:
+            ret = stream(
+                cli.connect_get_namespaced_pod_exec,
+                pod_name,
+                namespace,
+                command=exec_command,
+                stderr=True,
+                stdin=False,
+                stdout=True,
+                tty=False,
+            )
     except Exception:
         return False
     return ret
@@ -150,20 +203,78 @@ def get_node_status(node):
             return condition.status
 
 
+# Get the internal ip of the node
+def get_node_ip(node):
+    try:
+        node_info = cli.read_node(node)
+    except ApiException as e:
+        logging.error("Exception when calling CoreV1Api->read_node: %s\n" % e)
+        return ""
+    for address in node_info.status.addresses or []:
+        if address.type == "InternalIP":
+            return address.address
+    return ""
+
+
+# Watch the node until its Ready condition reports the expected status
+# Returns False when the status isn't reached within the timeout
+def watch_node_status(node, status, timeout):
+    node_watch = watch.Watch()
+    try:
+        for event in node_watch.stream(
+            cli.list_node, field_selector="metadata.name=%s" % node, timeout_seconds=timeout
+        ):
+            for condition in event["object"].status.conditions or []:
+                if condition.type == "Ready" and condition.status == status:
+                    node_watch.stop()
+                    return True
+    except ApiException as e:
+        logging.error("Exception when watching CoreV1Api->list_node: %s\n" % e)
+    return False
+
+
+# Watch the node until it is deleted from the cluster
+# Returns False when the node still exists after the timeout, the node is
+# only ever looked up by name so the rest of the nodes aren't listed
+def watch_node_deletion(node, timeout):
+    field_selector = "metadata.name=%s" % node
+    node_watch = watch.Watch()
+    try:
+        ret = cli.list_node(field_selector=field_selector)
+        if not ret.items:
+            return True
+        # Start from the version of the list so a deletion in between isn't missed
+        for event in node_watch.stream(
+            cli.list_node,
+            field_selector=field_selector,
+            resource_version=ret.metadata.resource_version,
+            timeout_seconds=timeout,
+        ):
+            if event["type"] == "DELETED":
+                node_watch.stop()
+                return True
+    except ApiException as e:
+        logging.error("Exception when watching CoreV1Api->list_node: %s\n" % e)
+    # Look the node up by name once more in case the watch ended early
+    try:
+        return not cli.list_node(field_selector=field_selector).items
+    except ApiException as e:
+        logging.error("Exception when calling CoreV1Api->list_node: %s\n" % e)
+    return False
+
+
 # Monitor the status of the cluster nodes and set the status to true or false
 def monitor_nodes():
-    nodes = list_nodes()
     notready_nodes = []
     node_kerneldeadlock_status = "False"
-    for node in nodes:
-        try:
-            node_info = cli.read_node_status(node, pretty=True)
-        except ApiException as e:
-            logging.error(
-                "Exception when calling \
-                           CoreV1Api->read_node_status: %s\n"
-                % e
-            )
+    # The node list already carries the status, no need to read it per node
+    try:
+        ret = cli.list_node(pretty=True)
+    except ApiException as e:
+        logging.error("Exception when calling CoreV1Api->list_node: %s\n" % e)
+        return False, []
+    for node_info in ret.items:
+        node = node_info.metadata.name
         for condition in node_info.status.conditions:
             if condition.type == "KernelDeadlock":
                 node_kerneldeadlock_status = condition.status
@@ -183,20 +294,17 @@ def monitor_nodes():
 # Monitor the status of the pods in the specified namespace
 # and set the status to true or false
 def monitor_namespace(namespace):
-    pods = list_pods(namespace)
     notready_pods = []
-    for pod in pods:
-        try:
-            pod_info = cli.read_namespaced_pod_status(pod, namespace, pretty=True)
-        except ApiException as e:
-            logging.error(
-                "Exception when calling \
-                           CoreV1Api->read_namespaced_pod_status: %s\n"
-                % e
-            )
+    # The pod list already carries the status, no need to read it per pod
+    try:
+        ret = cli.list_namespaced_pod(namespace, pretty=True)
+    except ApiException as e:
+        logging.error("Exception when calling CoreV1Api->list_namespaced_pod: %s\n" % e)
+        return False, []
+    for pod_info in ret.items:
         pod_status = pod_info.status.phase
         if pod_status != "Running" and pod_status != "Completed" and pod_status != "Succeeded":
-            notready_pods.append(pod)
+            notready_pods.append(pod_info.metadata.name)
     if len(notready_pods) != 0:
         status = False
     else:
@@ -214,24 +322,20 @@ def monitor_component(iteration, component_namespace):
 # Find the node kraken is deployed on
 # Set global kraken node to not delete
 def find_kraken_node():
-    pods = get_all_pods()
     kraken_pod_name = None
-    for pod in pods:
-        if "kraken-deployment" in pod[0]:
-            kraken_pod_name = pod[0]
-            kraken_project = pod[1]
+    # Let the api server filter on the kraken label first and only fall back
+    # to scanning every pod in the cluster when the label isn't set
+    for label_selector in (kraken_label_selector, None):
+        # Stop listing as soon as the pod is found rather than fetching every page
+        for pod in iterate_all_pods(label_selector):
+            if "kraken-deployment" in pod["metadata"]["name"]:
+                kraken_pod_name = pod["metadata"]["name"]
+                # The listed pod already carries the node it is scheduled on
+                node_name = pod["spec"].get("nodeName")
+                break
+        if kraken_pod_name:
             break
-    # have to switch to proper project
 
     if kraken_pod_name:
-        # get kraken-deployment pod, find node name
-        runcommand.invoke("kubectl config set-context --current --namespace=" + str(kraken_project))
-        pod_json_str = runcommand.invoke("kubectl get pods/" + str(kraken_pod_name) + " -o json")
-        pod_json = json.loads(pod_json_str)
-        node_name = pod_json["spec"]["nodeName"]
-
-        # Reset to the default project
-        runcommand.invoke("kubectl config set-context --current --namespace=default")
-
         global kraken_node_name
         kraken_node_name = node_name
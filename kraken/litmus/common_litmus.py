@@ -1,9 +1,11 @@
 import kraken.invoke.command as runcommand
 import logging
+import functools
 import time
 import sys
 import requests
 import yaml
+import kraken.yaml_loader.loader as yaml_loader
 import kraken.cerberus.setup as cerberus
 
 
@@ -12,15 +14,16 @@ def run(scenarios_list, config, litmus_namespaces, litmus_uninstall, wait_durati
     # Loop to run the scenarios starts here
     for l_scenario in scenarios_list:
         try:
+            # All the manifests of the scenario are applied by a single kubectl run
+            kubectl_files("apply", l_scenario)
             for item in l_scenario:
-                runcommand.invoke("kubectl apply -f %s" % item)
+                # Only the first document is needed, the rest of the stream isn't parsed
                 if "http" in item:
-                    f = requests.get(item)
-                    yaml_item = list(yaml.safe_load_all(f.content))[0]
+                    yaml_item = get_remote_manifest(item)
                 else:
-                    with open(item, "r") as f:
+                    with open(item, "rb") as f:
                         logging.info("opened yaml" + str(item))
-                        yaml_item = list(yaml.safe_load_all(f))[0]
+                        yaml_item = next(yaml.load_all(f, Loader=yaml_loader.SafeLoader))
 
                 if yaml_item["kind"] == "ChaosEngine":
                     engine_name = yaml_item["metadata"]["name"]
@@ -35,21 +38,38 @@ def run(scenarios_list, config, litmus_namespaces, litmus_uninstall, wait_durati
                         else:
                             logging.info("Scenario: %s was not successfully injected!" % item)
                             if litmus_uninstall:
-                                for l_item in l_scenario:
-                                    logging.info("item " + str(l_item))
-                                    runcommand.invoke("kubectl delete -f %s" % l_item)
+                                logging.info("items " + str(l_scenario))
+                                kubectl_files("delete", l_scenario)
             if litmus_uninstall:
-                for item in l_scenario:
-                    logging.info("item " + str(item))
-                    runcommand.invoke("kubectl delete -f %s" % item)
+                logging.info("items " + str(l_scenario))
+                kubectl_files("delete", l_scenario)
             logging.info("Waiting for the specified duration: %s" % wait_duration)
             time.sleep(wait_duration)
             cerberus.get_status(config)
         except Exception as e:
-            logging.error("Failed to run litmus scenario: %s. Encountered " "the following exception: %s" % (item, e))
+            logging.error(
+                "Failed to run litmus scenario: %s. Encountered " "the following exception: %s" % (l_scenario, e)
+            )
     return litmus_namespaces
 
 
+# Run a kubectl action (apply/delete) on a list of manifests in one kubectl process
+def kubectl_files(action, files):
+    argv = ["kubectl", action]
+    for item in files:
+        argv += ["-f", item]
+    runcommand.invoke_argv(argv)
+
+
+# Fetch and parse the first document of a remote manifest, remembered for the
+# rest of the run so it isn't downloaded again on every iteration
+@functools.lru_cache(maxsize=None)
+def get_remote_manifest(url):
+    response = requests.get(url)
+    response.raise_for_status()
+    return next(yaml.load_all(response.content, Loader=yaml_loader.SafeLoader))
+
+
 # Install litmus and wait until pod is running
 def install_litmus(version):
     runcommand.invoke("kubectl apply -f " "https://litmuschaos.github.io/litmus/litmus-operator-%s.yaml" % version)
@@ -1,5 +1,4 @@
 import sys
-import time
 import boto3
 import logging
 import kraken.kubernetes.client as kubecli
@@ -139,11 +138,7 @@ class aws_node_scenarios(abstract_node_scenarios):
                 logging.info("Terminating the node %s with instance ID: %s " % (node, instance_id))
                 self.aws.terminate_instances(instance_id)
                 self.aws.wait_until_terminated(instance_id)
-                for _ in range(timeout):
-                    if node not in kubecli.list_nodes():
-                        break
-                    time.sleep(1)
-                if node in kubecli.list_nodes():
+                if not kubecli.watch_node_deletion(node, timeout):
                     raise Exception("Node could not be terminated")
                 logging.info("Node with instance ID: %s has been terminated" % (instance_id))
                 logging.info("node_termination_scenario has been successfuly injected!")
@@ -2,6 +2,8 @@ import sys
 import time
 from azure.mgmt.compute import ComputeManagementClient
 from azure.identity import DefaultAzureCredential
+from azure.core.pipeline.transport import RequestsTransport
+import requests
 import logging
 import kraken.kubernetes.client as kubecli
 import kraken.node_actions.common_node_functions as nodeaction
@@ -10,98 +12,148 @@ import kraken.invoke.command as runcommand
 import yaml
 
 
-class Azure:
-    def __init__(self):
-        logging.info("azure " + str(self))
+# Credential, subscription and http transport shared by the Azure objects created during
+# the run, so the credential chain and the az cli are only queried once and the clients
+# reuse the same connection pool
+credentials = None
+subscription_id = None
+transport = None
+
+
+def setup_session():
+    global credentials, subscription_id, transport
+    if credentials is None:
         # Acquire a credential object using CLI-based authentication.
         credentials = DefaultAzureCredential()
         logging.info("credential " + str(credentials))
         az_account = runcommand.invoke("az account list -o yaml")
         az_account_yaml = yaml.load(az_account, Loader=yaml.FullLoader)
         subscription_id = az_account_yaml[0]["id"]
-        self.compute_client = ComputeManagementClient(credentials, subscription_id)
+        transport = RequestsTransport(session=requests.Session(), session_owner=False)
+    return credentials, subscription_id, transport
+
+
+class Azure:
+    # Seconds between status checks of long running operations when Azure doesn't return a
+    # retry-after hint, the SDK default of 30 seconds adds a lot of idle time per operation
+    polling_interval = 5
+
+    def __init__(self):
+        logging.info("azure " + str(self))
+        credentials, subscription_id, transport = setup_session()
+        self.compute_client = ComputeManagementClient(credentials, subscription_id, transport=transport)
+        # Resource group of the vms in the subscription keyed by vm name
+        self.vm_resource_groups = {}
+
+    # List the vms in the subscription once and index their resource groups by name
+    def index_vms(self):
+        for vm in self.compute_client.virtual_machines.list_all():
+            array = vm.id.split("/")
+            self.vm_resource_groups[array[-1]] = array[4]
 
     # Get the instance ID of the node
     def get_instance_id(self, node_name):
-        vm_list = self.compute_client.virtual_machines.list_all()
-        for vm in vm_list:
-            array = vm.id.split("/")
-            resource_group = array[4]
-            vm_name = array[-1]
-            if node_name == vm_name:
-                return vm_name, resource_group
+        # Only walk the vms in the subscription again for a vm that isn't indexed yet
+        if node_name not in self.vm_resource_groups:
+            self.index_vms()
+        if node_name in self.vm_resource_groups:
+            return node_name, self.vm_resource_groups[node_name]
         logging.error("Couldn't find vm with name " + str(node_name))
+        sys.exit(1)
 
     # Start the node instance
     def start_instances(self, group_name, vm_name):
         try:
-            self.compute_client.virtual_machines.begin_start(group_name, vm_name)
+            poller = self.compute_client.virtual_machines.begin_start(
+                group_name, vm_name, polling_interval=self.polling_interval
+            )
             logging.info("vm name " + str(vm_name) + " started")
+            return poller
         except Exception as e:
             logging.error("Failed to start node instance %s. Encountered following " "exception: %s." % (vm_name, e))
-            sys.exit(1)
+            raise
 
     # Stop the node instance
     def stop_instances(self, group_name, vm_name):
         try:
-            self.compute_client.virtual_machines.begin_power_off(group_name, vm_name)
+            poller = self.compute_client.virtual_machines.begin_power_off(
+                group_name, vm_name, polling_interval=self.polling_interval
+            )
             logging.info("vm name " + str(vm_name) + " stopped")
+            return poller
         except Exception as e:
             logging.error("Failed to stop node instance %s. Encountered following " "exception: %s." % (vm_name, e))
-            sys.exit(1)
+            raise
 
     # Terminate the node instance
     def terminate_instances(self, group_name, vm_name):
         try:
-            self.compute_client.virtual_machines.begin_delete(group_name, vm_name)
+            poller = self.compute_client.virtual_machines.begin_delete(
+                group_name, vm_name, polling_interval=self.polling_interval
+            )
             logging.info("vm name " + str(vm_name) + " terminated")
+            return poller
         except Exception as e:
             logging.error(
                 "Failed to terminate node instance %s. Encountered following " "exception: %s." % (vm_name, e)
             )
-            sys.exit(1)
+            raise
 
     # Reboot the node instance
     def reboot_instances(self, group_name, vm_name):
         try:
-            self.compute_client.virtual_machines.begin_restart(group_name, vm_name)
+            poller = self.compute_client.virtual_machines.begin_restart(
+                group_name, vm_name, polling_interval=self.polling_interval
+            )
             logging.info("vm name " + str(vm_name) + " rebooted")
+            return poller
         except Exception as e:
             logging.error("Failed to reboot node instance %s. Encountered following " "exception: %s." % (vm_name, e))
-            sys.exit(1)
+            raise
+
+    # Wait for the long running operation returned by the start/stop/terminate/reboot
+    # functions to finish, the poller follows the polling interval from Azure
+    def wait_for_operation(self, poller, vm_name, timeout):
+        poller.wait(timeout)
+        if not poller.done():
+            logging.info("Operation on vm %s did not finish in allotted time" % vm_name)
+            return False
+        return True
 
+    # Get the power state of the vm, the PowerState entry isn't always the second status
+    # and is missing altogether while the vm is transitioning, None means the power state
+    # isn't reported yet and callers should keep polling
     def get_vm_status(self, resource_group, vm_name):
         statuses = self.compute_client.virtual_machines.instance_view(resource_group, vm_name).statuses
-        status = len(statuses) >= 2 and statuses[1]
-        return status
+        return next((status for status in statuses if status.code.startswith("PowerState/")), None)
 
     # Wait until the node instance is running
     def wait_until_running(self, resource_group, vm_name, timeout):
         time_counter = 0
-        status = self.get_vm_status(resource_group, vm_name)
-        while status and status.code != "PowerState/running":
+        while True:
             status = self.get_vm_status(resource_group, vm_name)
+            if status and status.code == "PowerState/running":
+                return True
             logging.info("Vm %s is still not running, sleeping for 5 seconds" % vm_name)
             time.sleep(5)
             time_counter += 5
             if time_counter >= timeout:
                 logging.info("Vm %s is still not ready in allotted time" % vm_name)
                 return False
-        return True
 
     # Wait until the node instance is stopped
     def wait_until_stopped(self, resource_group, vm_name, timeout):
         time_counter = 0
-        status = self.get_vm_status(resource_group, vm_name)
-        while status and status.code != "PowerState/stopped":
+        while True:
             status = self.get_vm_status(resource_group, vm_name)
+            if status and status.code == "PowerState/stopped":
+                return True
             logging.info("Vm %s is still stopping, sleeping for 5 seconds" % vm_name)
             time.sleep(5)
             time_counter += 5
             if time_counter >= timeout:
                 logging.info("Vm %s is still not stopped in allotted time" % vm_name)
                 return False
-        return True
 
     # Wait until the node instance is terminated
     def wait_until_terminated(self, resource_group, vm_name, timeout):
@@ -129,13 +181,13 @@ class azure_node_scenarios(abstract_node_scenarios):
 
     # Node scenario to start the node
     def node_start_scenario(self, instance_kill_count, node, timeout):
+        vm_name, resource_group = self.azure.get_instance_id(node)
         for _ in range(instance_kill_count):
             try:
                 logging.info("Starting node_start_scenario injection")
-                vm_name, resource_group = self.azure.get_instance_id(node)
                 logging.info("Starting the node %s with instance ID: %s " % (vm_name, resource_group))
-                self.azure.start_instances(resource_group, vm_name)
-                self.azure.wait_until_running(resource_group, vm_name, timeout)
+                poller = self.azure.start_instances(resource_group, vm_name)
+                self.azure.wait_for_operation(poller, vm_name, timeout)
                 nodeaction.wait_for_ready_status(vm_name, timeout)
                 logging.info("Node with instance ID: %s is in running state" % node)
                 logging.info("node_start_scenario has been successfully injected!")
@@ -148,13 +200,13 @@ class azure_node_scenarios(abstract_node_scenarios):
 
     # Node scenario to stop the node
     def node_stop_scenario(self, instance_kill_count, node, timeout):
+        vm_name, resource_group = self.azure.get_instance_id(node)
         for _ in range(instance_kill_count):
             try:
                 logging.info("Starting node_stop_scenario injection")
-                vm_name, resource_group = self.azure.get_instance_id(node)
                 logging.info("Stopping the node %s with instance ID: %s " % (vm_name, resource_group))
-                self.azure.stop_instances(resource_group, vm_name)
-                self.azure.wait_until_stopped(resource_group, vm_name, timeout)
+                poller = self.azure.stop_instances(resource_group, vm_name)
+                self.azure.wait_for_operation(poller, vm_name, timeout)
                 logging.info("Node with instance ID: %s is in stopped state" % vm_name)
                 nodeaction.wait_for_unknown_status(vm_name, timeout)
             except Exception as e:
@@ -164,18 +216,14 @@ class azure_node_scenarios(abstract_node_scenarios):
 
     # Node scenario to terminate the node
     def node_termination_scenario(self, instance_kill_count, node, timeout):
+        vm_name, resource_group = self.azure.get_instance_id(node)
         for _ in range(instance_kill_count):
             try:
                 logging.info("Starting node_termination_scenario injection")
-                vm_name, resource_group = self.azure.get_instance_id(node)
                 logging.info("Terminating the node %s with instance ID: %s " % (vm_name, resource_group))
-                self.azure.terminate_instances(resource_group, vm_name)
-                self.azure.wait_until_terminated(resource_group, vm_name, timeout)
-                for _ in range(timeout):
-                    if vm_name not in kubecli.list_nodes():
-                        break
-                    time.sleep(1)
-                if vm_name in kubecli.list_nodes():
+                poller = self.azure.terminate_instances(resource_group, vm_name)
+                self.azure.wait_for_operation(poller, vm_name, timeout)
+                if not kubecli.watch_node_deletion(vm_name, timeout):
                     raise Exception("Node could not be terminated")
                 logging.info("Node with instance ID: %s has been terminated" % node)
                 logging.info("node_termination_scenario has been successfully injected!")
@@ -188,10 +236,10 @@ class azure_node_scenarios(abstract_node_scenarios):
 
     # Node scenario to reboot the node
     def node_reboot_scenario(self, instance_kill_count, node, timeout):
+        vm_name, resource_group = self.azure.get_instance_id(node)
         for _ in range(instance_kill_count):
             try:
                 logging.info("Starting node_reboot_scenario injection")
-                vm_name, resource_group = self.azure.get_instance_id(node)
                 logging.info("Rebooting the node %s with instance ID: %s " % (vm_name, resource_group))
                 self.azure.reboot_instances(resource_group, vm_name)
                 nodeaction.wait_for_unknown_status(vm_name, timeout)
@@ -3,7 +3,6 @@ import random
 import logging
 import paramiko
 import kraken.kubernetes.client as kubecli
-import kraken.invoke.command as runcommand
 
 
 node_general = False
@@ -11,7 +10,8 @@ node_general = False
 
 # Pick a random node with specified label selector
 def get_node(node_name, label_selector):
-    if node_name in kubecli.list_killable_nodes():
+    # Only list every node in the cluster when there's a node name to look for
+    if node_name and node_name in kubecli.list_killable_nodes():
         return node_name
     elif node_name:
         logging.info("Node with provided node_name does not exist or the node might " "be in NotReady state.")
@@ -26,35 +26,35 @@ def get_node(node_name, label_selector):
 
 # Wait till node status becomes Ready
 def wait_for_ready_status(node, timeout):
-    runcommand.invoke("kubectl wait --for=condition=Ready " "node/" + node + " --timeout=" + str(timeout) + "s")
+    if not kubecli.watch_node_status(node, "True", timeout):
+        logging.error("Timed out waiting for the node %s to be Ready" % node)
 
 
 # Wait till node status becomes NotReady
 def wait_for_unknown_status(node, timeout):
-    for _ in range(timeout):
-        if kubecli.get_node_status(node) == "Unknown":
-            break
-        time.sleep(3)
-    if kubecli.get_node_status(node) != "Unknown":
+    if not kubecli.watch_node_status(node, "Unknown", timeout) and kubecli.get_node_status(node) != "Unknown":
         raise Exception("Node condition status isn't Unknown")
 
 
 # Get the ip of the cluster node
 def get_node_ip(node):
-    return runcommand.invoke(
-        "kubectl get node %s -o " "jsonpath='{.status.addresses[?(@.type==\"InternalIP\")].address}'" % (node)
-    )
+    return kubecli.get_node_ip(node)
 
 
 def check_service_status(node, service, ssh_private_key, timeout):
     ssh = paramiko.SSHClient()
     ssh.set_missing_host_key_policy(paramiko.AutoAddPolicy())
-    i = 0
-    sleeper = 1
-    while i <= timeout:
+    attempt = 0
+    max_sleeper = 30
+    # Track the elapsed time with the monotonic clock so the time spent in ssh connect
+    # counts against the timeout and wall clock changes don't affect it
+    start_time = time.monotonic()
+    while time.monotonic() - start_time <= timeout:
         try:
+            # Back off exponentially with some jitter while the node is still coming up
+            sleeper = min(max_sleeper, 2 ** attempt) * random.uniform(0.9, 1.1)
+            attempt += 1
             time.sleep(sleeper)
-            i += sleeper
             logging.info("Trying to ssh to instance: %s" % (node))
             connection = ssh.connect(
                 node, username="root", key_filename=ssh_private_key, timeout=800, banner_timeout=400
@@ -182,11 +182,7 @@ class gcp_node_scenarios(abstract_node_scenarios):
                 logging.info("Terminating the node %s with instance ID: %s " % (node, instance_id))
                 self.gcp.terminate_instances(zone, instance_id)
                 self.gcp.wait_until_terminated(zone, instance_id, timeout)
-                for _ in range(timeout):
-                    if node not in kubecli.list_nodes():
-                        break
-                    time.sleep(1)
-                if node in kubecli.list_nodes():
+                if not kubecli.watch_node_deletion(node, timeout):
                     raise Exception("Node could not be terminated")
                 logging.info("Node with instance ID: %s has been terminated" % instance_id)
                 logging.info("node_termination_scenario has been successfuly injected!")
@@ -1,4 +1,4 @@
-import yaml
+import kraken.yaml_loader.loader as yaml_loader
 import logging
 import sys
 import time
@@ -14,21 +14,31 @@ import kraken.cerberus.setup as cerberus
 
 node_general = False
 
+# Node scenarios classes of the cloud types that only need the cloud credentials
+cloud_node_scenarios = {
+    "aws": aws_node_scenarios,
+    "gcp": gcp_node_scenarios,
+    "openstack": openstack_node_scenarios,
+    "azure": azure_node_scenarios,
+    "az": azure_node_scenarios,
+}
+
+# Node scenarios objects of the cloud types created so far, the cloud clients are set up
+# once and reused across the node scenarios and iterations
+cloud_node_scenario_objects = {}
+
 
 # Get the node scenarios object of specfied cloud type
 def get_node_scenario_object(node_scenario):
-    if "cloud_type" not in node_scenario.keys() or node_scenario["cloud_type"] == "generic":
+    if "cloud_type" not in node_scenario or node_scenario["cloud_type"] == "generic":
         global node_general
         node_general = True
         return general_node_scenarios()
-    if node_scenario["cloud_type"] == "aws":
-        return aws_node_scenarios()
-    elif node_scenario["cloud_type"] == "gcp":
-        return gcp_node_scenarios()
-    elif node_scenario["cloud_type"] == "openstack":
-        return openstack_node_scenarios()
-    elif node_scenario["cloud_type"] == "azure" or node_scenario["cloud_type"] == "az":
-        return azure_node_scenarios()
+    if node_scenario["cloud_type"] in cloud_node_scenarios:
+        node_scenarios_class = cloud_node_scenarios[node_scenario["cloud_type"]]
+        if node_scenarios_class not in cloud_node_scenario_objects:
+            cloud_node_scenario_objects[node_scenarios_class] = node_scenarios_class()
+        return cloud_node_scenario_objects[node_scenarios_class]
     elif node_scenario["cloud_type"] == "bm":
         return bm_node_scenarios(
             node_scenario.get("bmc_info"), node_scenario.get("bmc_user", None), node_scenario.get("bmc_password", None)
@@ -45,17 +55,16 @@ def get_node_scenario_object(node_scenario):
 # Run defined scenarios
 def run(scenarios_list, config, wait_duration):
     for node_scenario_config in scenarios_list:
-        with open(node_scenario_config, "r") as f:
-            node_scenario_config = yaml.full_load(f)
-            for node_scenario in node_scenario_config["node_scenarios"]:
-                node_scenario_object = get_node_scenario_object(node_scenario)
-                if node_scenario["actions"]:
-                    for action in node_scenario["actions"]:
-                        inject_node_scenario(action, node_scenario, node_scenario_object)
-                        logging.info("Waiting for the specified duration: %s" % (wait_duration))
-                        time.sleep(wait_duration)
-                        cerberus.get_status(config)
-                        logging.info("")
+        node_scenario_config = yaml_loader.load(node_scenario_config)
+        for node_scenario in node_scenario_config["node_scenarios"]:
+            node_scenario_object = get_node_scenario_object(node_scenario)
+            if node_scenario["actions"]:
+                for action in node_scenario["actions"]:
+                    inject_node_scenario(action, node_scenario, node_scenario_object)
+                    logging.info("Waiting for the specified duration: %s" % (wait_duration))
+                    time.sleep(wait_duration)
+                    cerberus.get_status(config)
+                    logging.info("")
 
 
 # Inject the specified node scenario
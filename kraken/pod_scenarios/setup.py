@@ -14,11 +14,7 @@ def run(kubeconfig_path, scenarios_list, config, failed_post_scenarios, wait_dur
                 pre_action_output = post_actions.run(kubeconfig_path, pod_scenario[1])
             else:
                 pre_action_output = ""
-            scenario_logs = runcommand.invoke(
-                "powerfulseal autonomous --use-pod-delete-instead-"
-                "of-ssh-kill --policy-file %s --kubeconfig %s "
-                "--no-cloud --inventory-kubernetes --headless" % (pod_scenario[0], kubeconfig_path)
-            )
+            scenario_logs = runcommand.invoke_argv(post_actions.powerfulseal_argv(pod_scenario[0], kubeconfig_path))
 
             # Display pod scenario logs/actions
             print(scenario_logs)
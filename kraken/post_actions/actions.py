@@ -2,15 +2,27 @@ import logging
 import kraken.invoke.command as runcommand
 
 
+# Arguments of the headless powerfulseal run for a policy file, passed straight
+# to the process instead of being parsed by a shell
+def powerfulseal_argv(policy_file, kubeconfig_path):
+    return [
+        "powerfulseal",
+        "autonomous",
+        "--use-pod-delete-instead-of-ssh-kill",
+        "--policy-file",
+        str(policy_file),
+        "--kubeconfig",
+        str(kubeconfig_path),
+        "--no-cloud",
+        "--inventory-kubernetes",
+        "--headless",
+    ]
+
+
 def run(kubeconfig_path, scenario, pre_action_output=""):
 
     if scenario.endswith(".yaml") or scenario.endswith(".yml"):
-        action_output = runcommand.invoke(
-            "powerfulseal autonomous "
-            "--use-pod-delete-instead-of-ssh-kill"
-            " --policy-file %s --kubeconfig %s --no-cloud"
-            " --inventory-kubernetes --headless" % (scenario, kubeconfig_path)
-        )
+        action_output = runcommand.invoke_argv(powerfulseal_argv(scenario, kubeconfig_path))
         # read output to make sure no error
         if "ERROR" in action_output:
             action_output.split("ERROR")[1].split("\n")[0]
@@ -22,27 +34,30 @@ def run(kubeconfig_path, scenario, pre_action_output=""):
 
     elif scenario.endswith(".py"):
         action_output = runcommand.invoke("python3 " + scenario).strip()
-        if pre_action_output:
-            if pre_action_output == action_output:
-                logging.info(scenario + " post action checks passed")
-            else:
-                logging.info(scenario + " post action response did not match pre check output")
-                logging.info("Pre action output: " + str(pre_action_output) + "\n")
-                logging.info("Post action output: " + str(action_output))
-                return False
+        if not outputs_match(scenario, action_output, pre_action_output):
+            return False
     elif scenario != "":
         # invoke custom bash script
         action_output = runcommand.invoke(scenario).strip()
-        if pre_action_output:
-            if pre_action_output == action_output:
-                logging.info(scenario + " post action checks passed")
-            else:
-                logging.info(scenario + " post action response did not match pre check output")
-                return False
+        if not outputs_match(scenario, action_output, pre_action_output):
+            return False
 
     return action_output
 
 
+# Compare the output of the post action with the one captured before injecting the scenario
+def outputs_match(scenario, action_output, pre_action_output):
+    if not pre_action_output:
+        return True
+    if pre_action_output == action_output:
+        logging.info(scenario + " post action checks passed")
+        return True
+    logging.info(scenario + " post action response did not match pre check output")
+    logging.info("Pre action output: " + str(pre_action_output) + "\n")
+    logging.info("Post action output: " + str(action_output))
+    return False
+
+
 # Perform the post scenario actions to see if components recovered
 def check_recovery(kubeconfig_path, scenario, failed_post_scenarios, pre_action_output):
 
@@ -1,7 +1,7 @@
 #!/usr/bin/env python
 
 import sys
-import yaml
+import kraken.yaml_loader.loader as yaml_loader
 import logging
 import time
 from multiprocessing.pool import ThreadPool
@@ -13,12 +13,15 @@ from kraken.node_actions.openstack_node_scenarios import OPENSTACKCLOUD
 from kraken.node_actions.az_node_scenarios import Azure
 from kraken.node_actions.gcp_node_scenarios import GCP
 
+# Maximum number of nodes stopped, started or waited on at the same time
+max_parallel = 10
 
-def multiprocess_nodes(cloud_object_function, nodes):
+
+def multiprocess_nodes(cloud_object_function, nodes, parallelism=max_parallel):
     try:
         # pool object with number of element
 
-        pool = ThreadPool(processes=len(nodes))
+        pool = ThreadPool(processes=min(len(nodes), parallelism))
         logging.info("nodes type " + str(type(nodes[0])))
         if type(nodes[0]) is tuple:
             node_id = []
@@ -38,16 +41,30 @@ def multiprocess_nodes(cloud_object_function, nodes):
         logging.info("Error on pool multiprocessing: " + str(e))
 
 
+# Wait on the nodes in parallel so the waits overlap instead of adding up
+# Returns the nodes that didn't reach the desired state
+def wait_for_nodes(wait_function, nodes, parallelism=max_parallel):
+    nodes = list(nodes)
+    pool = ThreadPool(processes=min(len(nodes), parallelism))
+    node_statuses = pool.map(wait_function, nodes)
+    pool.close()
+    return set(node for node, node_status in zip(nodes, node_statuses) if not node_status)
+
+
 # Inject the cluster shut down scenario
 def cluster_shut_down(shut_down_config):
     runs = shut_down_config["runs"]
     shut_down_duration = shut_down_config["shut_down_duration"]
     cloud_type = shut_down_config["cloud_type"]
     timeout = shut_down_config["timeout"]
+    parallelism = max_parallel
     if cloud_type.lower() == "aws":
         cloud_object = AWS()
     elif cloud_type.lower() == "gcp":
         cloud_object = GCP()
+        # The GCP client shares a single httplib2.Http which isn't thread safe, so its
+        # calls are made one at a time
+        parallelism = 1
     elif cloud_type.lower() == "openstack":
         cloud_object = OPENSTACKCLOUD()
     elif cloud_type.lower() in ["azure", "az"]:
@@ -62,40 +79,41 @@ def cluster_shut_down(shut_down_config):
         instance_id = cloud_object.get_instance_id(node)
         node_id.append(instance_id)
     logging.info("node id list " + str(node_id))
+
+    # The node ids of a cloud are either all ids or all tuples with the name and the
+    # group/zone, so decide how to call the wait functions once instead of per node
+    if node_id and type(node_id[0]) is tuple:
+
+        def wait_until_stopped(node):
+            return cloud_object.wait_until_stopped(node[1], node[0], timeout)
+
+        def wait_until_running(node):
+            return cloud_object.wait_until_running(node[1], node[0], timeout)
+
+    else:
+
+        def wait_until_stopped(node):
+            return cloud_object.wait_until_stopped(node, timeout)
+
+        def wait_until_running(node):
+            return cloud_object.wait_until_running(node, timeout)
+
     for _ in range(runs):
         logging.info("Starting cluster_shut_down scenario injection")
         stopping_nodes = set(node_id)
-        multiprocess_nodes(cloud_object.stop_instances, node_id)
-        stopped_nodes = stopping_nodes.copy()
+        multiprocess_nodes(cloud_object.stop_instances, node_id, parallelism)
         while len(stopping_nodes) > 0:
-            for node in stopping_nodes:
-                if type(node) is tuple:
-                    node_status = cloud_object.wait_until_stopped(node[1], node[0], timeout)
-                else:
-                    node_status = cloud_object.wait_until_stopped(node, timeout)
-
-                # Only want to remove node from stopping list when fully stopped/no error
-                if node_status:
-                    stopped_nodes.remove(node)
-
-            stopping_nodes = stopped_nodes.copy()
+            # Only want to remove node from stopping list when fully stopped/no error
+            stopping_nodes = wait_for_nodes(wait_until_stopped, stopping_nodes, parallelism)
 
         logging.info("Shutting down the cluster for the specified duration: %s" % (shut_down_duration))
         time.sleep(shut_down_duration)
         logging.info("Restarting the nodes")
-        restarted_nodes = set(node_id)
-        multiprocess_nodes(cloud_object.start_instances, node_id)
+        not_running_nodes = set(node_id)
+        multiprocess_nodes(cloud_object.start_instances, node_id, parallelism)
         logging.info("Wait for each node to be running again")
-        not_running_nodes = restarted_nodes.copy()
         while len(not_running_nodes) > 0:
-            for node in not_running_nodes:
-                if type(node) is tuple:
-                    node_status = cloud_object.wait_until_running(node[1], node[0], timeout)
-                else:
-                    node_status = cloud_object.wait_until_running(node, timeout)
-                if node_status:
-                    restarted_nodes.remove(node)
-            not_running_nodes = restarted_nodes.copy()
+            not_running_nodes = wait_for_nodes(wait_until_running, not_running_nodes, parallelism)
         logging.info("Waiting for 150s to allow cluster component initialization")
         time.sleep(150)
 
@@ -109,13 +127,12 @@ def run(scenarios_list, config, wait_duration):
             pre_action_output = post_actions.run("", shut_down_config[1])
         else:
             pre_action_output = ""
-        with open(shut_down_config[0], "r") as f:
-            shut_down_config_yaml = yaml.full_load(f)
-            shut_down_config_scenario = shut_down_config_yaml["cluster_shut_down_scenario"]
-            cluster_shut_down(shut_down_config_scenario)
-            logging.info("Waiting for the specified duration: %s" % (wait_duration))
-            time.sleep(wait_duration)
-            failed_post_scenarios = post_actions.check_recovery(
-                "", shut_down_config, failed_post_scenarios, pre_action_output
-            )
-            cerberus.publish_kraken_status(config, failed_post_scenarios)
+        shut_down_config_yaml = yaml_loader.load(shut_down_config[0])
+        shut_down_config_scenario = shut_down_config_yaml["cluster_shut_down_scenario"]
+        cluster_shut_down(shut_down_config_scenario)
+        logging.info("Waiting for the specified duration: %s" % (wait_duration))
+        time.sleep(wait_duration)
+        failed_post_scenarios = post_actions.check_recovery(
+            "", shut_down_config, failed_post_scenarios, pre_action_output
+        )
+        cerberus.publish_kraken_status(config, failed_post_scenarios)
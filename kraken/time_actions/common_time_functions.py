@@ -5,8 +5,17 @@ import kraken.invoke.command as runcommand
 import kraken.kubernetes.client as kubecli
 import re
 import sys
+from multiprocessing.pool import ThreadPool
 import kraken.cerberus.setup as cerberus
-import yaml
+import kraken.yaml_loader.loader as yaml_loader
+
+
+# Matches the output of the date command, compiled once as it's used on every retry
+date_regex = re.compile(r"[a-zA-Z0-9_() .]*\w{3} \w{3} \d{2} \d{2}:\d{2}:\d{2} \w{3} " r"\d{4}\W*")
+date_format = "%a %b %d %H:%M:%S %Z %Y"
+
+# Maximum number of objects worked on at the same time
+max_parallel = 10
 
 
 def pod_exec(pod_name, command, namespace):
@@ -29,6 +38,17 @@ def node_debug(node_name, command):
     return response
 
 
+# Call the function on each of the objects in parallel as the calls mostly wait on the
+# cluster, returns the results in the order of the objects
+def run_in_parallel(function, objects):
+    if not objects:
+        return []
+    pool = ThreadPool(processes=min(len(objects), max_parallel))
+    results = pool.map(function, objects)
+    pool.close()
+    return results
+
+
 def skew_time(scenario):
     skew_command = "date --set "
     if scenario["action"] == "skew_date":
@@ -39,33 +59,36 @@ def skew_time(scenario):
         skew_command += skewed_time
     if "node" in scenario["object_type"]:
         node_names = []
-        if "object_name" in scenario.keys() and scenario["object_name"]:
+        if scenario.get("object_name"):
             node_names = scenario["object_name"]
-        elif "label_selector" in scenario.keys() and scenario["label_selector"]:
+        elif scenario.get("label_selector"):
             node_names = kubecli.list_nodes(scenario["label_selector"])
 
-        for node in node_names:
+        def skew_node_time(node):
             node_debug(node, skew_command)
             logging.info("Reset date/time on node " + str(node))
+
+        run_in_parallel(skew_node_time, node_names)
         return "node", node_names
 
     elif "pod" in scenario["object_type"]:
         pod_names = []
-        if "object_name" in scenario.keys() and scenario["object_name"]:
+        if scenario.get("object_name"):
             for name in scenario["object_name"]:
-                if "namespace" not in scenario.keys():
+                if "namespace" not in scenario:
                     logging.error("Need to set namespace when using pod name")
                     sys.exit(1)
                 pod_names.append([name, scenario["namespace"]])
-        elif "label_selector" in scenario.keys() and scenario["label_selector"]:
+        elif scenario.get("label_selector"):
             pod_names = kubecli.get_all_pods(scenario["label_selector"])
-        elif "namespace" in scenario.keys() and scenario["namespace"]:
+        elif scenario.get("namespace"):
             pod_names = kubecli.list_pods(scenario["namespace"])
             counter = 0
             for pod_name in pod_names:
                 pod_names[counter] = [pod_name, scenario["namespace"]]
                 counter += 1
 
+        # The pods are skewed one at a time, execs on the shared kubernetes client can't overlap
         for pod in pod_names:
             if len(pod) > 1:
                 pod_exec(pod[0], skew_command, pod[1])
@@ -78,7 +101,7 @@ def skew_time(scenario):
 # From kubectl/oc command get time output
 def parse_string_date(obj_datetime):
     try:
-        date_line = re.search(r"[a-zA-Z0-9_() .]*\w{3} \w{3} \d{2} \d{2}:\d{2}:\d{2} \w{3} " r"\d{4}\W*", obj_datetime)
+        date_line = date_regex.search(obj_datetime)
         return date_line.group().strip()
     except Exception:
         return ""
@@ -88,65 +111,77 @@ def parse_string_date(obj_datetime):
 def string_to_date(obj_datetime):
     obj_datetime = parse_string_date(obj_datetime)
     try:
-        date_time_obj = datetime.datetime.strptime(obj_datetime, "%a %b %d %H:%M:%S %Z %Y")
+        date_time_obj = datetime.datetime.strptime(obj_datetime, date_format)
         return date_time_obj
     except Exception:
         return datetime.datetime(datetime.MINYEAR, 1, 1)
 
 
-def check_date_time(object_type, names):
+# Wait for the date/time on the node to be reset, returns the node name when it isn't
+def check_node_date_time(node_name):
     skew_command = "date"
-    not_reset = []
     max_retries = 30
+    first_date_time = datetime.datetime.utcnow()
+    node_datetime_string = node_debug(node_name, skew_command)
+    node_datetime = string_to_date(node_datetime_string)
+    counter = 0
+    while not first_date_time < node_datetime < datetime.datetime.utcnow():
+        time.sleep(10)
+        logging.info("Date/time on node %s still not reset, waiting 10 seconds and retrying" % node_name)
+        node_datetime_string = node_debug(node_name, skew_command)
+        node_datetime = string_to_date(node_datetime_string)
+        counter += 1
+        if counter > max_retries:
+            logging.error("Date and time in node %s didn't reset properly" % node_name)
+            return node_name
+    if counter < max_retries:
+        logging.info("Date in node " + str(node_name) + " reset properly")
+    return None
+
+
+# Wait for the date/time in the pod to be reset, returns the pod name when it isn't
+def check_pod_date_time(pod_name):
+    skew_command = "date"
+    max_retries = 30
+    first_date_time = datetime.datetime.utcnow()
+    counter = 0
+    pod_datetime_string = pod_exec(pod_name[0], skew_command, pod_name[1])
+    pod_datetime = string_to_date(pod_datetime_string)
+    while not first_date_time < pod_datetime < datetime.datetime.utcnow():
+        time.sleep(10)
+        logging.info("Date/time on pod %s still not reset, waiting 10 seconds and retrying" % pod_name[0])
+        first_date_time = datetime.datetime.utcnow()
+        pod_datetime = pod_exec(pod_name[0], skew_command, pod_name[1])
+        pod_datetime = string_to_date(pod_datetime)
+        counter += 1
+        if counter > max_retries:
+            logging.error("Date and time in pod %s didn't reset properly" % pod_name[0])
+            return pod_name[0]
+    if counter < max_retries:
+        logging.info("Date in pod " + str(pod_name[0]) + " reset properly")
+    return None
+
+
+# Check the objects in parallel as each check mostly sleeps waiting on the clock to be reset,
+# the pod execs themselves are serialized on the shared kubernetes client
+def check_date_time(object_type, names):
     if object_type == "node":
-        for node_name in names:
-            first_date_time = datetime.datetime.utcnow()
-            node_datetime_string = node_debug(node_name, skew_command)
-            node_datetime = string_to_date(node_datetime_string)
-            counter = 0
-            while not first_date_time < node_datetime < datetime.datetime.utcnow():
-                time.sleep(10)
-                logging.info("Date/time on node %s still not reset, waiting 10 seconds and retrying" % node_name)
-                node_datetime_string = node_debug(node_name, skew_command)
-                node_datetime = string_to_date(node_datetime_string)
-                counter += 1
-                if counter > max_retries:
-                    logging.error("Date and time in node %s didn't reset properly" % node_name)
-                    not_reset.append(node_name)
-                    break
-            if counter < max_retries:
-                logging.info("Date in node " + str(node_name) + " reset properly")
+        results = run_in_parallel(check_node_date_time, names)
     elif object_type == "pod":
-        for pod_name in names:
-            first_date_time = datetime.datetime.utcnow()
-            counter = 0
-            pod_datetime_string = pod_exec(pod_name[0], skew_command, pod_name[1])
-            pod_datetime = string_to_date(pod_datetime_string)
-            while not first_date_time < pod_datetime < datetime.datetime.utcnow():
-                time.sleep(10)
-                logging.info("Date/time on pod %s still not reset, waiting 10 seconds and retrying" % pod_name[0])
-                first_date_time = datetime.datetime.utcnow()
-                pod_datetime = pod_exec(pod_name[0], skew_command, pod_name[1])
-                pod_datetime = string_to_date(pod_datetime)
-                counter += 1
-                if counter > max_retries:
-                    logging.error("Date and time in pod %s didn't reset properly" % pod_name[0])
-                    not_reset.append(pod_name[0])
-                    break
-            if counter < max_retries:
-                logging.info("Date in pod " + str(pod_name[0]) + " reset properly")
-    return not_reset
+        results = run_in_parallel(check_pod_date_time, names)
+    else:
+        results = []
+    return [name for name in results if name is not None]
 
 
 def run(scenarios_list, config, wait_duration):
     for time_scenario_config in scenarios_list:
-        with open(time_scenario_config, "r") as f:
-            scenario_config = yaml.full_load(f)
-            for time_scenario in scenario_config["time_scenarios"]:
-                object_type, object_names = skew_time(time_scenario)
-                not_reset = check_date_time(object_type, object_names)
-                if len(not_reset) > 0:
-                    logging.info("Object times were not reset")
-                logging.info("Waiting for the specified duration: %s" % (wait_duration))
-                time.sleep(wait_duration)
-                cerberus.publish_kraken_status(config, not_reset)
+        scenario_config = yaml_loader.load(time_scenario_config)
+        for time_scenario in scenario_config["time_scenarios"]:
+            object_type, object_names = skew_time(time_scenario)
+            not_reset = check_date_time(object_type, object_names)
+            if len(not_reset) > 0:
+                logging.info("Object times were not reset")
+            logging.info("Waiting for the specified duration: %s" % (wait_duration))
+            time.sleep(wait_duration)
+            cerberus.publish_kraken_status(config, not_reset)
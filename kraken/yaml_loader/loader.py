@@ -0,0 +1,26 @@
+import os
+import json
+import functools
+import yaml
+
+# Prefer the libyaml backed loader when PyYAML was built with it
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
+
+# Load a yaml file, the parsed content is cached on the path and modification time of the
+# file so scenario configs read on every iteration are only parsed again when they change.
+# The returned object is shared between callers and must not be modified
+def load(path):
+    return parse(path, os.path.getmtime(path))
+
+
+@functools.lru_cache(maxsize=64)
+def parse(path, mtime):
+    with open(path, "r") as f:
+        # JSON is valid yaml but the json module parses it a lot faster
+        if path.endswith(".json"):
+            return json.load(f)
+        return yaml.load(f, Loader=SafeLoader)
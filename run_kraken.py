@@ -2,14 +2,11 @@
 
 import os
 import sys
-import yaml
 import logging
-import optparse
-import pyfiglet
+import argparse
 import uuid
 import time
 import kraken.kubernetes.client as kubecli
-import kraken.invoke.command as runcommand
 import kraken.litmus.common_litmus as common_litmus
 import kraken.time_actions.common_time_functions as time_actions
 import kraken.performance_dashboards.setup as performance_dashboards
@@ -18,18 +15,23 @@ import kraken.namespace_actions.common_namespace_functions as namespace_actions
 import kraken.shut_down.common_shut_down_func as shut_down
 import kraken.node_actions.run as nodeaction
 import kraken.kube_burner.client as kube_burner
+import kraken.prometheus.client as prometheus
+import kraken.yaml_loader.loader as yaml_loader
 
 
 # Main function
 def main(cfg):
-    # Start kraken
-    print(pyfiglet.figlet_format("kraken"))
+    # Start kraken, pyfiglet is only imported when the banner is printed
+    # as loading its font is a noticeable part of the startup time
+    if not os.environ.get("KRAKEN_NO_BANNER"):
+        import pyfiglet
+
+        print(pyfiglet.figlet_format("kraken"))
     logging.info("Starting kraken")
 
     # Parse and read the config
     if os.path.isfile(cfg):
-        with open(cfg, "r") as f:
-            config = yaml.full_load(f)
+        config = yaml_loader.load(cfg)
         global kubeconfig_path, wait_duration
         distribution = config["kraken"].get("distribution", "openshift")
         kubeconfig_path = config["kraken"].get("kubeconfig_path", "")
@@ -67,11 +69,10 @@ def main(cfg):
 
         # Cluster info
         logging.info("Fetching cluster info")
-        cluster_version = runcommand.invoke("kubectl get clusterversion")
-        cluster_info = runcommand.invoke(
-            "kubectl cluster-info | awk 'NR==1' | sed -r " "'s/\x1B\[([0-9]{1,3}(;[0-9]{1,2})?)?[mGK]//g'"
-        )  # noqa
-        logging.info("\n%s%s" % (cluster_version, cluster_info))
+        cluster_version = kubecli.get_clusterversion()
+        if cluster_version:
+            logging.info("Cluster version is %s" % cluster_version)
+        logging.info("Kubernetes master is running at %s" % kubecli.get_host())
 
         # Deploy performance dashboards
         if deploy_performance_dashboards:
@@ -150,12 +151,22 @@ def main(cfg):
         # Capture the end time
         end_time = int(time.time())
 
+        # Fetch kube-burner once as it's used both to capture metrics and to check alerts
+        if capture_metrics or enable_alerts:
+            kube_burner.setup(kube_burner_url)
+            # Look up the prometheus route and token once for both the metrics and the alerts
+            if not prometheus_url:
+                logging.info(
+                    "Looks like prometheus_url is not defined, trying to use the default instance on the cluster"
+                )
+            prometheus_url, prometheus_bearer_token = prometheus.instance(
+                distribution, prometheus_url, prometheus_bearer_token
+            )
+
         # Capture metrics for the run
         if capture_metrics:
             logging.info("Capturing metrics")
-            kube_burner.setup(kube_burner_url)
             kube_burner.scrape_metrics(
-                distribution,
                 run_uuid,
                 prometheus_url,
                 prometheus_bearer_token,
@@ -168,10 +179,9 @@ def main(cfg):
         # Check for the alerts specified
         if enable_alerts:
             logging.info("Alerts checking is enabled")
-            kube_burner.setup(kube_burner_url)
             if alert_profile:
                 kube_burner.alerts(
-                    distribution, prometheus_url, prometheus_bearer_token, start_time, end_time, alert_profile,
+                    prometheus_url, prometheus_bearer_token, start_time, end_time, alert_profile,
                 )
             else:
                 logging.error("Alert profile is not defined")
@@ -195,11 +205,11 @@ def main(cfg):
 
 if __name__ == "__main__":
     # Initialize the parser to read the config
-    parser = optparse.OptionParser()
-    parser.add_option(
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
         "-c", "--config", dest="cfg", help="config location", default="config/config.yaml",
     )
-    (options, args) = parser.parse_args()
+    options = parser.parse_args()
     logging.basicConfig(
         level=logging.INFO,
         format="%(asctime)s [%(levelname)s] %(message)s",